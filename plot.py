@@ -1,13 +1,51 @@
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+from pyarrow import csv as pa_csv
+import matplotlib
+
+matplotlib.use("Agg")  # Headless backend: plots are only saved to disk
 import matplotlib.pyplot as plt
+from matplotlib.ticker import FuncFormatter, MaxNLocator
 import seaborn as sns
 import os
+import re
 import warnings
+from concurrent.futures import ProcessPoolExecutor
 
 # --- Configuration ---
 CSV_FILE = "integration_comparison.csv"
 OUTPUT_DIR = "plots"
-DPI = 300  # High resolution for saved plots
+DPI = 150  # Resolution for the raster (PNG) plots; vector plots ignore it
+# Light zlib compression for PNGs: slightly larger files, much faster writes
+PNG_SAVE_OPTIONS = {"optimize": False, "compress_level": 3}
+# Columns read from the CSV and their types. AbsoluteError is read as text
+# because invalid runs are written as "INVALID_N".
+CSV_DTYPES = {
+    "FunctionName": pa.string(),
+    "Method": pa.string(),
+    "NumIntervals": pa.int64(),
+    "AbsoluteError": pa.string(),
+    "ExecutionTime_ms": pa.float64(),
+}
+CSV_BLOCK_SIZE = 8 << 20  # Bytes of CSV parsed per chunk (8 MiB)
+METHOD_PREFIX = re.compile(r"^\d+\.\s*")  # Leading "1. " style numbering
+
+# Style stacks for each plot. Every figure applies its own stack so the result
+# does not depend on which plots a worker process happened to draw before it.
+CONVERGENCE_STYLE = ["seaborn-v0_8-whitegrid"]
+EFFICIENCY_STYLE = ["seaborn-v0_8-whitegrid", "seaborn-v0_8-talk"]
+RANKING_STYLE = ["seaborn-v0_8-whitegrid", "seaborn-v0_8-talk", "seaborn-v0_8-pastel"]
+HEATMAP_STYLE = ["classic"]
+
+# Per-method colors, markers and line styles for the convergence plot
+CONVERGENCE_COLORS = plt.get_cmap("tab10").colors
+CONVERGENCE_MARKERS = ["o", "s", "^", "D", "v", "P", "X", "*"]
+CONVERGENCE_LINESTYLES = ["-", "--", "-.", ":"]
+
+# Above this many points per function the efficiency plot switches from a
+# scatter plot to a hexbin density plot
+HEXBIN_THRESHOLD = 2000
 
 # Suppress warnings for a cleaner output, e.g., from using log scale with zero values
 warnings.filterwarnings("ignore", category=UserWarning)
@@ -22,25 +60,125 @@ def load_and_clean_data(filepath):
         print("Please run the C program first to generate the CSV file.")
         return None
 
-    df = pd.read_csv(filepath)
+    # Reuse the cleaned data from a previous run unless the CSV has changed since
+    cache_path = os.path.splitext(filepath)[0] + ".parquet"
+    if os.path.exists(cache_path) and os.path.getmtime(cache_path) > os.path.getmtime(
+        filepath
+    ):
+        df = pd.read_parquet(cache_path)
+        print(f"Data loaded from cache '{cache_path}'.")
+        return df
+
+    # Stream the file in fixed-size blocks with Arrow's CSV reader so only one
+    # chunk of raw rows is held in memory at a time. Only the plotted columns
+    # are read, with explicit types to skip inference.
+    reader = pa_csv.open_csv(
+        filepath,
+        read_options=pa_csv.ReadOptions(block_size=CSV_BLOCK_SIZE),
+        convert_options=pa_csv.ConvertOptions(
+            include_columns=list(CSV_DTYPES), column_types=CSV_DTYPES
+        ),
+    )
+
+    chunks = []
+    for batch in reader:
+        chunk = batch.to_pandas()
 
-    # Convert columns to numeric, coercing errors (like 'INVALID_N') to NaN
-    df["AbsoluteError"] = pd.to_numeric(df["AbsoluteError"], errors="coerce")
+        # Convert columns to numeric, coercing errors (like 'INVALID_N') to NaN
+        chunk["AbsoluteError"] = pd.to_numeric(chunk["AbsoluteError"], errors="coerce")
 
-    # Drop rows where the calculation was invalid
-    df.dropna(inplace=True)
+        # Drop rows where the calculation was invalid
+        chunk.dropna(subset=["AbsoluteError"], inplace=True)
 
-    # Clean up method names by removing the leading number and period (e.g., "1. Left Rectangle" -> "Left Rectangle")
-    df["Method"] = df["Method"].str.split(". ").str[1]
+        # Clean up method names by removing the leading number and period (e.g., "1. Left Rectangle" -> "Left Rectangle")
+        chunk["Method"] = chunk["Method"].str.replace(METHOD_PREFIX, "", regex=True)
+
+        chunks.append(chunk)
+
+    if not chunks:
+        print(f"Error: The file '{filepath}' contains no data rows.")
+        return None
+    df = pd.concat(chunks, ignore_index=True)
 
     # For Monte Carlo, error can sometimes be zero if it gets the exact answer by chance.
     # To plot on a log scale, replace zero error with a very small number.
-    df["AbsoluteError"] = df["AbsoluteError"].replace(0, 1e-16)
+    df.loc[df["AbsoluteError"].to_numpy() == 0, "AbsoluteError"] = 1e-16
+
+    # Dictionary-encode the label columns so grouping and hue lookups work on
+    # integer codes. Categories keep the order in which labels first appear.
+    for col in ("Method", "FunctionName"):
+        df[col] = pd.Categorical(df[col], categories=df[col].unique())
+
+    df.to_parquet(cache_path, compression="zstd", index=False)
 
     print("Data loaded and cleaned successfully.")
     return df
 
 
+def _run_with_style(style, plot_func, *args):
+    """
+    Calls a single-figure plot helper under the given style stack.
+    Used for work submitted to worker processes, where each task draws
+    one figure and must not depend on styles left by earlier tasks.
+    """
+    with plt.style.context(style):
+        plot_func(*args)
+
+
+def _safe_function_names(df):
+    """
+    Maps every function name to a form that can be used in a filename.
+    """
+    return {name: name.replace("^", "") for name in df["FunctionName"].cat.categories}
+
+
+def _plot_convergence_one(subset_df, func_name, safe_name, ax=None):
+    """
+    Draws and saves the convergence plot for a single function.
+    Kept at module level so it can be dispatched to a worker process.
+    If an existing Axes is passed it is cleared and reused instead of
+    creating (and closing) a new Figure. The caller applies CONVERGENCE_STYLE.
+    """
+    # Sort once up front so each method's line is already ordered by N
+    subset_df = subset_df.sort_values(["Method", "NumIntervals"], kind="mergesort")
+
+    owns_figure = ax is None
+    if owns_figure:
+        fig, ax = plt.subplots(figsize=(12, 8))
+    else:
+        fig = ax.figure
+        ax.clear()
+
+    # Draw one log-log line per method directly with matplotlib
+    for i, (method, group) in enumerate(
+        subset_df.groupby("Method", sort=False, observed=True)
+    ):
+        ax.loglog(
+            group["NumIntervals"].to_numpy(),
+            group["AbsoluteError"].to_numpy(),
+            color=CONVERGENCE_COLORS[i % len(CONVERGENCE_COLORS)],
+            marker=CONVERGENCE_MARKERS[i % len(CONVERGENCE_MARKERS)],
+            linestyle=CONVERGENCE_LINESTYLES[i % len(CONVERGENCE_LINESTYLES)],
+            label=method,
+        )
+
+    ax.set_title(
+        f"Convergence of Integration Methods for f(x) = {func_name}",
+        fontsize=16,
+        weight="bold",
+    )
+    ax.set_xlabel("Number of Intervals (log scale)", fontsize=12)
+    ax.set_ylabel("Absolute Error (log scale)", fontsize=12)
+    ax.legend(title="Integration Method", fontsize=10)
+    ax.grid(True, which="both", ls="--")
+
+    fig.tight_layout()
+    filename = os.path.join(OUTPUT_DIR, f"1_convergence_{safe_name}.svg")
+    fig.savefig(filename)  # Vector output: lines are emitted once as paths
+    if owns_figure:
+        plt.close(fig)
+
+
 def plot_convergence(df):
     """
     PLOT 1: Error Convergence Plot
@@ -50,69 +188,79 @@ def plot_convergence(df):
     """
     print("Generating Plot 1: Error Convergence...")
 
-    # Get unique function names to create a separate plot for each
-    functions = df["FunctionName"].unique()
-
-    for func_name in functions:
-        plt.style.use("seaborn-v0_8-whitegrid")
+    # The style is applied once and a single Figure is reused (cleared) for
+    # every function's plot
+    with plt.style.context(CONVERGENCE_STYLE):
         fig, ax = plt.subplots(figsize=(12, 8))
 
-        subset_df = df[df["FunctionName"] == func_name]
-
-        # Use seaborn for a beautiful line plot with automatic color handling and legend
-        sns.lineplot(
-            data=subset_df,
-            x="NumIntervals",
-            y="AbsoluteError",
-            hue="Method",
-            style="Method",  # Use different line styles as well
-            markers=True,
-            dashes=True,
-            ax=ax,
-        )
+        # Partition the data once and create a separate plot for each function
+        safe_names = _safe_function_names(df)
+        for func_name, subset_df in df.groupby(
+            "FunctionName", sort=False, observed=True
+        ):
+            _plot_convergence_one(subset_df, func_name, safe_names[func_name], ax=ax)
 
-        ax.set_xscale("log")
-        ax.set_yscale("log")
-        ax.set_title(
-            f"Convergence of Integration Methods for f(x) = {func_name}",
-            fontsize=16,
-            weight="bold",
-        )
-        ax.set_xlabel("Number of Intervals (log scale)", fontsize=12)
-        ax.set_ylabel("Absolute Error (log scale)", fontsize=12)
-        ax.legend(title="Integration Method", fontsize=10)
-        ax.grid(True, which="both", ls="--")
-
-        plt.tight_layout()
-        filename = os.path.join(
-            OUTPUT_DIR, f'1_convergence_{func_name.replace("^", "")}.png'
-        )
-        plt.savefig(filename, dpi=DPI)
         plt.close(fig)
 
     print("Convergence plots saved.")
 
 
-def plot_performance_vs_accuracy(df):
+def _log10_col(s):
     """
-    PLOT 2: Performance vs. Accuracy Scatter Plot
-    This creative plot shows the trade-off between speed (execution time) and accuracy.
-    The ideal method would be in the bottom-left corner (fast and accurate).
+    Returns log10 of a column as a NumPy array, with non-positive values
+    (which a log axis cannot show) mapped to NaN.
     """
-    print("Generating Plot 2: Performance vs. Accuracy...")
+    values = s.to_numpy(dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(values > 0, np.log10(values), np.nan)
 
-    functions = df["FunctionName"].unique()
 
-    for func_name in functions:
-        plt.style.use("seaborn-v0_8-talk")
-        fig, ax = plt.subplots(figsize=(14, 9))
+def _format_decade_axis(axis):
+    """
+    Labels an axis holding log10 values as powers of ten, one tick per
+    (whole) decade as on a log scale.
+    """
+    axis.set_major_locator(MaxNLocator(integer=True))
+    axis.set_major_formatter(FuncFormatter(lambda v, _: f"$10^{{{round(v)}}}$"))
 
-        subset_df = df[df["FunctionName"] == func_name]
 
+def _plot_performance_vs_accuracy_one(subset_df, func_name, safe_name, ax=None):
+    """
+    Draws and saves the performance vs. accuracy plot for a single function.
+    Kept at module level so it can be dispatched to a worker process.
+    If an existing Axes is passed it is cleared and reused instead of
+    creating (and closing) a new Figure. The caller applies EFFICIENCY_STYLE.
+    """
+    owns_figure = ax is None
+    if owns_figure:
+        fig, ax = plt.subplots(figsize=(14, 9))
+    else:
+        fig = ax.figure
+        ax.clear()
+
+    # Take log10 once and plot on linear axes labelled in decades, so no
+    # log transform has to be applied to every point at draw time
+    log_df = subset_df.assign(
+        LogTime=_log10_col(subset_df["ExecutionTime_ms"]),
+        LogError=_log10_col(subset_df["AbsoluteError"]),
+    ).dropna(subset=["LogTime", "LogError"])
+
+    colorbar = None
+    if len(log_df) > HEXBIN_THRESHOLD:
+        # Too many points to draw one marker each: bin them into hexagons
+        hexbin = ax.hexbin(
+            log_df["LogTime"],
+            log_df["LogError"],
+            gridsize=40,
+            cmap="viridis",
+            mincnt=1,
+        )
+        colorbar = fig.colorbar(hexbin, ax=ax, label="Number of runs")
+    else:
         sns.scatterplot(
-            data=subset_df,
-            x="ExecutionTime_ms",
-            y="AbsoluteError",
+            data=log_df,
+            x="LogTime",
+            y="LogError",
             hue="Method",
             size="NumIntervals",
             sizes=(50, 500),  # Control the range of point sizes
@@ -121,18 +269,19 @@ def plot_performance_vs_accuracy(df):
             palette="viridis",
         )
 
-        ax.set_xscale("log")
-        ax.set_yscale("log")
-        ax.set_title(
-            f"Accuracy vs. Execution Time for f(x) = {func_name}",
-            fontsize=18,
-            weight="bold",
-        )
-        ax.set_xlabel("Execution Time in milliseconds (log scale)", fontsize=14)
-        ax.set_ylabel("Absolute Error (log scale)", fontsize=14)
+    _format_decade_axis(ax.xaxis)
+    _format_decade_axis(ax.yaxis)
+    ax.set_title(
+        f"Accuracy vs. Execution Time for f(x) = {func_name}",
+        fontsize=18,
+        weight="bold",
+    )
+    ax.set_xlabel("Execution Time in milliseconds (log scale)", fontsize=14)
+    ax.set_ylabel("Absolute Error (log scale)", fontsize=14)
 
-        # Improve legend handling
-        handles, labels = ax.get_legend_handles_labels()
+    # Improve legend handling (the hexbin view has no legend entries)
+    handles, labels = ax.get_legend_handles_labels()
+    if handles:
         ax.legend(
             handles,
             labels,
@@ -141,11 +290,37 @@ def plot_performance_vs_accuracy(df):
             borderaxespad=0.0,
         )
 
-        plt.tight_layout(rect=[0, 0, 0.85, 1])  # Adjust layout to make space for legend
-        filename = os.path.join(
-            OUTPUT_DIR, f'2_efficiency_{func_name.replace("^", "")}.png'
-        )
-        plt.savefig(filename, dpi=DPI)
+    fig.tight_layout(rect=[0, 0, 0.85, 1])  # Adjust layout to make space for legend
+    filename = os.path.join(OUTPUT_DIR, f"2_efficiency_{safe_name}.png")
+    fig.savefig(filename, dpi=DPI, pil_kwargs=PNG_SAVE_OPTIONS)
+    if owns_figure:
+        plt.close(fig)
+    elif colorbar is not None:
+        # ax.clear() does not remove the colorbar's own Axes
+        colorbar.remove()
+
+
+def plot_performance_vs_accuracy(df):
+    """
+    PLOT 2: Performance vs. Accuracy Scatter Plot
+    This creative plot shows the trade-off between speed (execution time) and accuracy.
+    The ideal method would be in the bottom-left corner (fast and accurate).
+    """
+    print("Generating Plot 2: Performance vs. Accuracy...")
+
+    # The style is applied once and a single Figure is reused (cleared) for
+    # every function's plot
+    with plt.style.context(EFFICIENCY_STYLE):
+        fig, ax = plt.subplots(figsize=(14, 9))
+
+        safe_names = _safe_function_names(df)
+        for func_name, subset_df in df.groupby(
+            "FunctionName", sort=False, observed=True
+        ):
+            _plot_performance_vs_accuracy_one(
+                subset_df, func_name, safe_names[func_name], ax=ax
+            )
+
         plt.close(fig)
 
     print("Efficiency plots saved.")
@@ -163,29 +338,49 @@ def plot_final_accuracy_ranking(df):
     max_n = df["NumIntervals"].max()
     final_df = df[df["NumIntervals"] == max_n]
 
-    plt.style.use("seaborn-v0_8-pastel")
-    fig, ax = plt.subplots(figsize=(15, 8))
-
-    sns.barplot(
-        data=final_df,
-        x="FunctionName",
-        y="AbsoluteError",
-        hue="Method",
-        ax=ax,
-        palette="magma",
+    # One row per function, one column per method. observed=True leaves out
+    # methods without a valid result at max_n, so they get no empty bar slots.
+    grouped = (
+        final_df.groupby(["FunctionName", "Method"], observed=True)["AbsoluteError"]
+        .first()
+        .unstack("Method")
     )
 
-    ax.set_yscale("log")
-    ax.set_title(f"Final Accuracy Ranking at N = {max_n:,}", fontsize=16, weight="bold")
-    ax.set_xlabel("Mathematical Function", fontsize=12)
-    ax.set_ylabel("Absolute Error (log scale)", fontsize=12)
-    ax.legend(title="Method", bbox_to_anchor=(1.02, 1), loc="upper left")
-    ax.tick_params(axis="x", rotation=10)  # Slightly rotate x-axis labels if needed
+    with plt.style.context(RANKING_STYLE):
+        fig, ax = plt.subplots(figsize=(15, 8))
+
+        # Grouped bar chart: each method's bars are offset within a group
+        # whose total width is 0.8, centred on the function's tick
+        x_positions = np.arange(len(grouped.index))
+        width = 0.8 / len(grouped.columns)
+        palette = sns.color_palette("magma", len(grouped.columns), desat=0.75)
+        for i, method in enumerate(grouped.columns):
+            offset = (i - (len(grouped.columns) - 1) / 2) * width
+            ax.bar(
+                x_positions + offset,
+                grouped[method].to_numpy(),
+                width,
+                label=method,
+                color=palette[i],
+            )
+
+        ax.set_xticks(x_positions, grouped.index)
+        ax.set_xlim(-0.5, len(grouped.index) - 0.5)
+        ax.xaxis.grid(False)
 
-    plt.tight_layout(rect=[0, 0, 0.85, 1])
-    filename = os.path.join(OUTPUT_DIR, "3_final_accuracy_ranking.png")
-    plt.savefig(filename, dpi=DPI)
-    plt.close(fig)
+        ax.set_yscale("log")
+        ax.set_title(
+            f"Final Accuracy Ranking at N = {max_n:,}", fontsize=16, weight="bold"
+        )
+        ax.set_xlabel("Mathematical Function", fontsize=12)
+        ax.set_ylabel("Absolute Error (log scale)", fontsize=12)
+        ax.legend(title="Method", bbox_to_anchor=(1.02, 1), loc="upper left")
+        ax.tick_params(axis="x", rotation=10)  # Slightly rotate x-axis labels if needed
+
+        plt.tight_layout(rect=[0, 0, 0.85, 1])
+        filename = os.path.join(OUTPUT_DIR, "3_final_accuracy_ranking.svg")
+        plt.savefig(filename)
+        plt.close(fig)
     print("Final accuracy plot saved.")
 
 
@@ -197,34 +392,37 @@ def plot_execution_time_heatmap(df):
     """
     print("Generating Plot 4: Execution Time Heatmap...")
 
-    # We average the time across the different functions for a general overview
-    pivot_df = df.pivot_table(
-        index="Method",
-        columns="NumIntervals",
-        values="ExecutionTime_ms",
-        aggfunc="mean",  # Average time across all functions
+    # We average the time across the different functions for a general overview.
+    # Only the three needed columns are projected before aggregating, and
+    # observed=True keeps just the (Method, N) pairs that actually occur instead
+    # of the full Cartesian product of the categorical Method column.
+    pivot_df = (
+        df[["Method", "NumIntervals", "ExecutionTime_ms"]]
+        .groupby(["Method", "NumIntervals"], observed=True)["ExecutionTime_ms"]
+        .mean()  # Average time across all functions
+        .unstack("NumIntervals")
     )
 
-    plt.style.use("classic")
-    fig, ax = plt.subplots(figsize=(12, 8))
+    with plt.style.context(HEATMAP_STYLE):
+        fig, ax = plt.subplots(figsize=(12, 8))
 
-    sns.heatmap(
-        pivot_df,
-        annot=True,  # Annotate cells with the time values
-        fmt=".2f",  # Format annotations to 2 decimal places
-        cmap="rocket_r",  # Use a reversed colormap (darker is higher)
-        linewidths=0.5,
-        ax=ax,
-    )
+        sns.heatmap(
+            pivot_df,
+            annot=True,  # Annotate cells with the time values
+            fmt=".2f",  # Format annotations to 2 decimal places
+            cmap="rocket_r",  # Use a reversed colormap (darker is higher)
+            linewidths=0.5,
+            ax=ax,
+        )
 
-    ax.set_title("Average Execution Time (ms) Heatmap", fontsize=16, weight="bold")
-    ax.set_xlabel("Number of Intervals", fontsize=12)
-    ax.set_ylabel("Integration Method", fontsize=12)
+        ax.set_title("Average Execution Time (ms) Heatmap", fontsize=16, weight="bold")
+        ax.set_xlabel("Number of Intervals", fontsize=12)
+        ax.set_ylabel("Integration Method", fontsize=12)
 
-    plt.tight_layout()
-    filename = os.path.join(OUTPUT_DIR, "4_execution_time_heatmap.png")
-    plt.savefig(filename, dpi=DPI)
-    plt.close(fig)
+        plt.tight_layout()
+        filename = os.path.join(OUTPUT_DIR, "4_execution_time_heatmap.png")
+        plt.savefig(filename, dpi=DPI, pil_kwargs=PNG_SAVE_OPTIONS)
+        plt.close(fig)
     print("Execution time heatmap saved.")
 
 
@@ -239,11 +437,41 @@ def main():
     data_df = load_and_clean_data(CSV_FILE)
 
     if data_df is not None:
-        # Generate all plots
-        plot_convergence(data_df)
-        plot_performance_vs_accuracy(data_df)
-        plot_final_accuracy_ranking(data_df)
-        plot_execution_time_heatmap(data_df)
+        # Every figure is independent, so draw them in parallel worker processes
+        print("Generating all plots in parallel...")
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            jobs = []
+            safe_names = _safe_function_names(data_df)
+            for func_name, subset_df in data_df.groupby(
+                "FunctionName", sort=False, observed=True
+            ):
+                safe_name = safe_names[func_name]
+                jobs.append(
+                    executor.submit(
+                        _run_with_style,
+                        CONVERGENCE_STYLE,
+                        _plot_convergence_one,
+                        subset_df,
+                        func_name,
+                        safe_name,
+                    )
+                )
+                jobs.append(
+                    executor.submit(
+                        _run_with_style,
+                        EFFICIENCY_STYLE,
+                        _plot_performance_vs_accuracy_one,
+                        subset_df,
+                        func_name,
+                        safe_name,
+                    )
+                )
+            jobs.append(executor.submit(plot_final_accuracy_ranking, data_df))
+            jobs.append(executor.submit(plot_execution_time_heatmap, data_df))
+
+            # Surface any exception raised inside a worker
+            for job in jobs:
+                job.result()
 
         print(
             f"\nAll plots have been successfully saved to the '{OUTPUT_DIR}/' directory."